@@ -5,6 +5,7 @@ Mail Merge + QR Code (DOCX, X/Y positioning) – Streamlit App
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 from mailmerge import MailMerge
 from docx import Document
 from docxcompose.composer import Composer
@@ -13,11 +14,20 @@ from docx.oxml import OxmlElement, parse_xml
 from docx.oxml.ns import qn
 from docx.opc.constants import RELATIONSHIP_TYPE as RT
 import qrcode
+try:
+    import segno  # native PNG writer, much faster than qrcode+PIL
+except ImportError:
+    segno = None
+import copy
+import hashlib
 import tempfile
+import multiprocessing
 import os
+import posixpath
 import zipfile
-import io
 from io import BytesIO
+from lxml import etree
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # ============ CONFIG ============
 REQUIRED_COL = "Property_Account_No"
@@ -26,30 +36,17 @@ EMU_PER_INCH = 914400
 
 # ============ HELPER FUNCTIONS ============
 
-def sanitize_filename(name: str) -> str:
-    return (name.replace("/", "-").replace("\\", "-").replace(":", "-")
-                .replace("*", "-").replace("?", "-").replace("\"", "-")
-                .replace("<", "-").replace(">", "-").replace("|", "-"))
-
-def _new_anchor(run, image_path, width_inches, height_inches, pos_x_inches, pos_y_inches):
-    """Create wp:anchor element for floating image at absolute page coords."""
-    part = run.part
+# Single-pass character substitution; the chained str.replace version
+# allocated a new string per bad character on the hot path.
+_SANITIZE_TABLE = str.maketrans({c: "-" for c in '/\\:*?"<>|'})
 
-    # Read image and wrap in BytesIO so python-docx can seek()
-    with open(image_path, "rb") as f:
-        image_bytes = f.read()
-    image_stream = BytesIO(image_bytes)
-
-    # Add image part correctly
-    image_part = part.package.image_parts.get_or_add_image_part(image_stream)
-    rId = part.relate_to(image_part, RT.IMAGE)
-
-    cx = int(width_inches * EMU_PER_INCH)
-    cy = int(height_inches * EMU_PER_INCH)
-    pos_x = int(pos_x_inches * EMU_PER_INCH)
-    pos_y = int(pos_y_inches * EMU_PER_INCH)
+def sanitize_filename(name: str) -> str:
+    return name.translate(_SANITIZE_TABLE)
 
-    anchor_xml = f"""
+# The anchor XML is identical for every QR apart from five values
+# (position, extent, rId), so parse it exactly once at import and patch
+# clones per call instead of building and re-parsing the string N times.
+_ANCHOR_TEMPLATE = parse_xml("""
     <wp:anchor xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
                xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"
                xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"
@@ -58,12 +55,12 @@ def _new_anchor(run, image_path, width_inches, height_inches, pos_x_inches, pos_
                behindDoc="0" locked="0" layoutInCell="1" allowOverlap="1">
       <wp:simplePos x="0" y="0" />
       <wp:positionH relativeFrom="page">
-        <wp:posOffset>{pos_x}</wp:posOffset>
+        <wp:posOffset>0</wp:posOffset>
       </wp:positionH>
       <wp:positionV relativeFrom="page">
-        <wp:posOffset>{pos_y}</wp:posOffset>
+        <wp:posOffset>0</wp:posOffset>
       </wp:positionV>
-      <wp:extent cx="{cx}" cy="{cy}" />
+      <wp:extent cx="0" cy="0" />
       <wp:effectExtent l="0" t="0" r="0" b="0" />
       <wp:wrapSquare wrapText="bothSides" />
       <wp:docPr id="1" name="QR Code"/>
@@ -76,13 +73,13 @@ def _new_anchor(run, image_path, width_inches, height_inches, pos_x_inches, pos_
               <pic:cNvPicPr/>
             </pic:nvPicPr>
             <pic:blipFill>
-              <a:blip r:embed="{rId}" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"/>
+              <a:blip xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"/>
               <a:stretch><a:fillRect/></a:stretch>
             </pic:blipFill>
             <pic:spPr>
               <a:xfrm>
                 <a:off x="0" y="0"/>
-                <a:ext cx="{cx}" cy="{cy}"/>
+                <a:ext cx="0" cy="0"/>
               </a:xfrm>
               <a:prstGeom prst="rect"><a:avLst/></a:prstGeom>
             </pic:spPr>
@@ -90,52 +87,343 @@ def _new_anchor(run, image_path, width_inches, height_inches, pos_x_inches, pos_
         </a:graphicData>
       </a:graphic>
     </wp:anchor>
+""")
+
+_POS_H_PATH = qn("wp:positionH") + "/" + qn("wp:posOffset")
+_POS_V_PATH = qn("wp:positionV") + "/" + qn("wp:posOffset")
+
+
+def _new_anchor(part, image_bytes, width_inches, height_inches, pos_x_inches, pos_y_inches):
+    """Create wp:anchor element for floating image at absolute page coords.
+
+    Takes the raw PNG bytes; the single BytesIO built here shares the
+    bytes object's buffer (CPython copy-on-write) rather than copying it.
     """
-    return parse_xml(anchor_xml)
+    # Add image part correctly
+    image_part = part.package.image_parts.get_or_add_image_part(BytesIO(image_bytes))
+    rId = part.relate_to(image_part, RT.IMAGE)
 
-def add_qr_xy_to_docx(docx_path: str, url: str, qr_temp_folder: str,
-                      x_inches: float, y_inches: float,
-                      qr_size_inches: float) -> bool:
-    """Add QR as floating image at absolute (x_inches, y_inches) from top-left of page."""
-    try:
-        # Create QR image
-        qr = qrcode.make(url)
-        qr_png = os.path.join(qr_temp_folder, f"qr_{os.path.basename(docx_path)}.png")
-        qr.save(qr_png)
-
-        # Open existing docx
-        doc = Document(docx_path)
-
-        # Use the last existing paragraph (on page 1 in your template)
-        # so we don't create an extra blank page.
-        if doc.paragraphs:
-            p = doc.paragraphs[-1]
+    cx = str(int(width_inches * EMU_PER_INCH))
+    cy = str(int(height_inches * EMU_PER_INCH))
+
+    anchor = copy.deepcopy(_ANCHOR_TEMPLATE)
+    anchor.find(_POS_H_PATH).text = str(int(pos_x_inches * EMU_PER_INCH))
+    anchor.find(_POS_V_PATH).text = str(int(pos_y_inches * EMU_PER_INCH))
+    extent = anchor.find(qn("wp:extent"))
+    extent.set("cx", cx)
+    extent.set("cy", cy)
+    ext = anchor.find(".//" + qn("a:ext"))
+    ext.set("cx", cx)
+    ext.set("cy", cy)
+    anchor.find(".//" + qn("a:blip")).set(qn("r:embed"), rId)
+    return anchor
+
+# Mailout campaigns repeat URLs (multi-occurrence accounts), so encode
+# each unique URL once per worker process and reuse the PNG bytes.
+_qr_cache = {}
+_qr_encoder = None  # lazily built, reused qrcode.QRCode (fallback path)
+
+def _qr_png_bytes(url: str) -> bytes:
+    """Encode a QR PNG with cheap settings, memoized by URL.
+
+    Low error correction and a small box size keep the pixel count down
+    (the image is embedded at under an inch anyway), and compress_level=1
+    slashes the zlib time PIL spends on the PNG.
+    """
+    global _qr_encoder
+    png = _qr_cache.get(url)
+    if png is None:
+        buf = BytesIO()
+        if segno is not None:
+            segno.make(url, error="l", micro=False).save(
+                buf, kind="png", scale=4, border=2)
         else:
-            p = doc.add_paragraph()
-
-        run = p.add_run()
-
-        # Create floating anchor
-        anchor = _new_anchor(
-            run,
-            qr_png,
-            width_inches=qr_size_inches,
-            height_inches=qr_size_inches,
-            pos_x_inches=x_inches,
-            pos_y_inches=y_inches,
-        )
+            # One pre-configured encoder, cleared between URLs, instead
+            # of constructing a fresh QRCode per call.
+            if _qr_encoder is None:
+                _qr_encoder = qrcode.QRCode(
+                    error_correction=qrcode.constants.ERROR_CORRECT_L,
+                    box_size=4,
+                    border=2,
+                )
+            _qr_encoder.clear()
+            _qr_encoder.add_data(url)
+            _qr_encoder.make(fit=True)
+            _qr_encoder.make_image().save(
+                buf, format="PNG", optimize=False, compress_level=1)
+        png = buf.getvalue()
+        _qr_cache[url] = png
+    return png
+
+
+def add_qr_xy_to_doc(doc, url: str,
+                     x_inches: float, y_inches: float,
+                     qr_size_inches: float) -> None:
+    """Add QR as floating image at absolute (x_inches, y_inches) from top-left of page.
+
+    Mutates an already-open Document; the caller decides when to save so
+    each output file is serialized to disk exactly once. The QR image
+    stays in memory the whole way — python-docx only needs a file-like.
+    """
+    qr_bytes = _qr_png_bytes(url)
+
+    # Work on the body element directly: doc.paragraphs would build a
+    # proxy object per paragraph just to reach the last one.
+    # Use the last existing paragraph (on page 1 in your template)
+    # so we don't create an extra blank page.
+    body = doc.element.body
+    paragraphs = body.findall(qn("w:p"))
+    if paragraphs:
+        p = paragraphs[-1]
+    else:
+        p = OxmlElement("w:p")
+        body.append(p)
+
+    run = OxmlElement("w:r")
+    p.append(run)
+
+    # Create floating anchor
+    anchor = _new_anchor(
+        doc.part,
+        qr_bytes,
+        width_inches=qr_size_inches,
+        height_inches=qr_size_inches,
+        pos_x_inches=x_inches,
+        pos_y_inches=y_inches,
+    )
+
+    drawing = OxmlElement("w:drawing")
+    drawing.append(anchor)
+    run.append(drawing)
+
+
+# OPC namespaces used by the fast combiner.
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+_MEDIA_MIME = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+}
+
+
+def _fast_combine(docx_paths: list, out_path: str) -> None:
+    """Concatenate same-template DOCX files into one document.
+
+    Every output here comes from the same template, so styles, numbering
+    and theme parts are identical across files. That lets us append each
+    file's <w:body> children straight into the first document's body
+    (page break in between) instead of paying docxcompose's re-parse of
+    the ever-growing master per append. Relationship-backed parts (the
+    QR images) are copied across under fresh rIds.
+    """
+    with zipfile.ZipFile(docx_paths[0]) as zf:
+        parts = {name: zf.read(name) for name in zf.namelist()}
+
+    master = etree.fromstring(parts["word/document.xml"])
+    body = master.find(f"{{{_W_NS}}}body")
+    sect_pr = body.find(f"{{{_W_NS}}}sectPr")
+    insert_at = body.index(sect_pr) if sect_pr is not None else len(body)
+
+    rels = etree.fromstring(parts["word/_rels/document.xml.rels"])
+    next_rid = 1 + max(
+        (int(rel.get("Id")[3:]) for rel in rels
+         if rel.get("Id", "").startswith("rId") and rel.get("Id")[3:].isdigit()),
+        default=0,
+    )
+
+    # Identical media (mailouts sharing a QR URL share PNG bytes) should
+    # land in the master once, keyed by content digest. Seed the map with
+    # the first document's own media.
+    media_by_digest = {
+        hashlib.sha1(data).digest(): name[len("word/"):]
+        for name, data in parts.items()
+        if name.startswith("word/media/")
+    }
+    media_exts = set()
+    media_count = 0
+    for path in docx_paths[1:]:
+        with zipfile.ZipFile(path) as zf2:
+            doc2 = etree.fromstring(zf2.read("word/document.xml"))
+            rels2 = {}
+            if "word/_rels/document.xml.rels" in zf2.namelist():
+                for rel in etree.fromstring(zf2.read("word/_rels/document.xml.rels")):
+                    rels2[rel.get("Id")] = rel
+            body2 = doc2.find(f"{{{_W_NS}}}body")
+
+            # Re-home every relationship reference in the appended body.
+            rid_map = {}
+            for el in body2.iter():
+                for attr, val in el.attrib.items():
+                    if not attr.startswith(f"{{{_R_NS}}}") or val not in rels2:
+                        continue
+                    if val not in rid_map:
+                        rel = rels2[val]
+                        new_id = f"rId{next_rid}"
+                        next_rid += 1
+                        new_rel = etree.SubElement(rels, f"{{{_REL_NS}}}Relationship")
+                        new_rel.set("Id", new_id)
+                        new_rel.set("Type", rel.get("Type"))
+                        if rel.get("TargetMode") == "External":
+                            new_rel.set("Target", rel.get("Target"))
+                            new_rel.set("TargetMode", "External")
+                        else:
+                            src_part = posixpath.normpath(
+                                posixpath.join("word", rel.get("Target")))
+                            data = zf2.read(src_part)
+                            digest = hashlib.sha1(data).digest()
+                            target = media_by_digest.get(digest)
+                            if target is None:
+                                ext = src_part.rsplit(".", 1)[-1].lower()
+                                media_count += 1
+                                target = f"media/combined_{media_count}.{ext}"
+                                parts[f"word/{target}"] = data
+                                media_exts.add(ext)
+                                media_by_digest[digest] = target
+                            new_rel.set("Target", target)
+                        rid_map[val] = new_id
+                    el.set(attr, rid_map[val])
+
+            page_break = etree.fromstring(
+                f'<w:p xmlns:w="{_W_NS}"><w:r><w:br w:type="page"/></w:r></w:p>')
+            body.insert(insert_at, page_break)
+            insert_at += 1
+            for child in list(body2):
+                if child.tag == f"{{{_W_NS}}}sectPr":
+                    continue
+                body.insert(insert_at, child)
+                insert_at += 1
+
+    content_types = etree.fromstring(parts["[Content_Types].xml"])
+    declared = {d.get("Extension", "").lower()
+                for d in content_types if d.tag == f"{{{_CT_NS}}}Default"}
+    for ext in media_exts - declared:
+        default = etree.SubElement(content_types, f"{{{_CT_NS}}}Default")
+        default.set("Extension", ext)
+        default.set("ContentType", _MEDIA_MIME.get(ext, "image/png"))
+
+    parts["word/document.xml"] = etree.tostring(
+        master, xml_declaration=True, encoding="UTF-8", standalone=True)
+    parts["word/_rels/document.xml.rels"] = etree.tostring(
+        rels, xml_declaration=True, encoding="UTF-8", standalone=True)
+    parts["[Content_Types].xml"] = etree.tostring(
+        content_types, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+    with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED) as zout:
+        for name, data in parts.items():
+            zout.writestr(name, data)
+
+
+# Per-worker template state, installed once by the pool initializer so
+# every task doesn't have to carry (and pickle) the same bytes. The
+# template is parsed a single time per worker; rows get a deepcopy of
+# the pristine part trees, which is several times cheaper than
+# re-unzipping and re-parsing the XML.
+_TPL_BYTES = None
+_TPL_MM = None
+_TPL_PARTS = None
+
+
+def _init_worker(template_bytes):
+    global _TPL_BYTES, _TPL_MM, _TPL_PARTS
+    _TPL_BYTES = template_bytes
+    try:
+        mm = MailMerge(BytesIO(template_bytes))
+        _TPL_PARTS = {zi: copy.deepcopy(tree) for zi, tree in mm.parts.items()}
+        _TPL_MM = mm
+    except Exception:
+        # Unknown mailmerge internals — fall back to a parse per row.
+        _TPL_MM = None
+        _TPL_PARTS = None
+
+
+def _merged_doc(merge_dict):
+    """Return a MailMerge with this row's values substituted.
+
+    Reuses the worker's parsed template when possible; the returned
+    object must only be close()d when it is not the shared instance.
+    """
+    if _TPL_MM is not None:
+        mm = _TPL_MM
+        mm.parts = {zi: copy.deepcopy(tree) for zi, tree in _TPL_PARTS.items()}
+    else:
+        mm = MailMerge(BytesIO(_TPL_BYTES))
+    mm.merge(**merge_dict)
+    return mm
 
-        drawing = OxmlElement("w:drawing")
-        drawing.append(anchor)
-        run._r.append(drawing)
 
-        # Save updated document
-        doc.save(docx_path)
-        return True
+def _render_row(merge_dict, docx_abs, account, url,
+                x_pos, y_pos, qr_size):
+    """Worker: mail-merge one row and optionally stamp its QR.
 
+    Runs in a pool process, so it must not touch Streamlit; it returns
+    (docx_path_or_None, warning_or_None) for the main process to report.
+    """
+    try:
+        mm = _merged_doc(merge_dict)
+        if not url:
+            mm.write(docx_abs)
+            if mm is not _TPL_MM:
+                mm.close()
+            return docx_abs, None
+        # Keep the merged result in memory and stamp the QR before the
+        # one and only write to disk, instead of save/reopen/save.
+        merged_buf = BytesIO()
+        mm.write(merged_buf)
+        if mm is not _TPL_MM:
+            mm.close()
     except Exception as e:
-        st.warning(f"⚠️ QR XY failed for {os.path.basename(docx_path)}: {e}")
-        return False
+        return None, f"⚠️ Error for {account}: {str(e)[:120]}"
+
+    try:
+        merged_buf.seek(0)
+        doc = Document(merged_buf)
+        add_qr_xy_to_doc(
+            doc, url,
+            x_inches=x_pos, y_inches=y_pos,
+            qr_size_inches=qr_size,
+        )
+        doc.save(docx_abs)
+        return docx_abs, None
+    except Exception as e:
+        # Still deliver the merged document, just without its QR.
+        with open(docx_abs, "wb") as f:
+            f.write(merged_buf.getvalue())
+        return docx_abs, f"⚠️ QR XY failed for {os.path.basename(docx_abs)}: {e}"
+
+# Streamlit reruns this script top to bottom on every widget change;
+# keying these on the upload bytes means tweaking QR settings between
+# runs doesn't re-parse the same spreadsheet and template.
+
+@st.cache_data(show_spinner=False)
+def _template_merge_fields(template_bytes: bytes) -> frozenset:
+    tpl = MailMerge(BytesIO(template_bytes))
+    fields = frozenset(tpl.get_merge_fields())
+    tpl.close()
+    return fields
+
+
+@st.cache_data(show_spinner=False)
+def _load_dataframe(excel_bytes: bytes, needed_cols: frozenset) -> pd.DataFrame:
+    # dtype=str with keep_default_na=False hands every cell over as a
+    # string with blanks as "", so no fillna/astype rewrite is needed.
+    read_kwargs = dict(
+        usecols=lambda c: str(c).strip() in needed_cols,
+        dtype=str,
+        keep_default_na=False,
+    )
+    try:
+        # calamine (Rust) parses xlsx several times faster than openpyxl.
+        df = pd.read_excel(BytesIO(excel_bytes), engine="calamine", **read_kwargs)
+    except (ImportError, ValueError):
+        df = pd.read_excel(BytesIO(excel_bytes), **read_kwargs)
+    df.columns = df.columns.str.strip()
+    return df
+
 
 # ============ STREAMLIT UI ============
 
@@ -164,6 +452,13 @@ with st.sidebar:
         min_value=0.3, max_value=2.0, value=0.9, step=0.1
     )
 
+    build_combined = st.checkbox(
+        "Also build combined DOCX",
+        value=False,
+        help="Appending every mailout into one file doubles the XML work; "
+             "leave off unless you need the single combined document."
+    )
+
     st.info(f"Required Excel column: `{REQUIRED_COL}`")
     if qr_mode == "With QR":
         st.info(f"QR URL column: `{QR_URL_COL}`")
@@ -192,23 +487,22 @@ if st.button("🚀 Run Mail Merge", type="primary", use_container_width=True):
     with st.spinner("Processing..."):
         try:
             with tempfile.TemporaryDirectory() as tmpdir:
-                excel_path = os.path.join(tmpdir, "data.xlsx")
-                template_path = os.path.join(tmpdir, "template.docx")
                 output_folder = os.path.join(tmpdir, "output")
-                qr_temp_folder = os.path.join(tmpdir, "qr_temp")
                 os.makedirs(output_folder, exist_ok=True)
-                os.makedirs(qr_temp_folder, exist_ok=True)
 
-                with open(excel_path, "wb") as f:
-                    f.write(uploaded_excel.read())
-                with open(template_path, "wb") as f:
-                    f.write(uploaded_template.read())
+                # The uploads never need to touch disk: Streamlit already
+                # holds the bytes and both pandas and MailMerge accept
+                # file-like objects. Workers merge against the in-memory
+                # template copy instead of reopening a file per row.
+                template_bytes = uploaded_template.getvalue()
 
-                df = pd.read_excel(excel_path).fillna("")
-                df.columns = [c.strip() for c in df.columns]
-                for col in df.columns:
-                    if df[col].dtype != "object":
-                        df[col] = df[col].astype(str)
+                # Only parse the columns the merge can actually consume:
+                # the template's merge fields plus the app's own columns.
+                merge_fields = _template_merge_fields(template_bytes)
+                needed_cols = frozenset(
+                    merge_fields | {REQUIRED_COL, QR_URL_COL, "Property County"})
+
+                df = _load_dataframe(uploaded_excel.getvalue(), needed_cols)
 
                 if REQUIRED_COL not in df.columns:
                     st.error(f"❌ Excel file missing required column: `{REQUIRED_COL}`")
@@ -219,99 +513,157 @@ if st.button("🚀 Run Mail Merge", type="primary", use_container_width=True):
                     st.warning(f"⚠️ Column '{QR_URL_COL}' not found. QR codes will be skipped.")
                     qr_mode = "Without QR"
 
-                df["Account_Frequency"] = df.groupby(REQUIRED_COL)[REQUIRED_COL].transform("count")
-                df["Occurrence_Number"] = df.groupby(REQUIRED_COL).cumcount() + 1
+                # value_counts + map is one hash pass, lighter than a
+                # groupby transform; sort=False on the cumcount groupby
+                # skips the hidden sort of the key column. int32 halves
+                # the footprint of both derived columns.
+                counts = df[REQUIRED_COL].value_counts()
+                df["Account_Frequency"] = df[REQUIRED_COL].map(counts).astype("int32")
+                df["Occurrence_Number"] = (
+                    df.groupby(REQUIRED_COL, sort=False).cumcount() + 1
+                ).astype("int32")
+
+                # Build all output filenames in one vectorized pass instead of
+                # per-row string work inside the loop.
+                acct = df[REQUIRED_COL].astype(str).str.strip()
+                if "Property County" in df.columns:
+                    county = df["Property County"].astype(str).str.strip().str.upper()
+                else:
+                    county = pd.Series(["UNKNOWN"] * len(df), index=df.index)
+                # Compare on the raw NumPy arrays; skips pandas' index
+                # alignment on the two comparisons and the combine.
+                dup_mask = ((df["Account_Frequency"].to_numpy() > 1)
+                            & (df["Occurrence_Number"].to_numpy() > 1))
+                df["_Base_Name"] = pd.Series(
+                    np.where(dup_mask, acct + "_" + county + "_Mailout", acct + "_Mailout"),
+                    index=df.index,
+                ).str.translate(_SANITIZE_TABLE)
 
-                generated_docx_list = []
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 error_count = 0
 
-                for idx, row in df.iterrows():
-                    account = str(row.get(REQUIRED_COL, "Unknown")).strip()
+                # Build the per-row work list, then fan it out to a process
+                # pool: each row is independent (template parse -> merge ->
+                # docx write -> QR stamp) and CPU-bound on XML and PNG work.
+                # itertuples avoids iterrows' per-row Series allocation,
+                # and the str/strip/upper work is done once per column as
+                # vectorized pandas ops rather than per row in Python.
+                cols = list(df.columns)
+                want_url = qr_mode == "With QR" and has_qr_col
+                accounts = df[REQUIRED_COL].astype(str).str.strip().to_numpy()
+                base_names = df["_Base_Name"].to_numpy()
+                urls = (df[QR_URL_COL].astype(str).str.strip().to_numpy()
+                        if want_url else None)
+
+                # Keyed by output path: occurrences beyond the second of
+                # the same account share a base name, and two workers must
+                # never race on one file. Later rows replace earlier ones,
+                # so the last write wins just like the serial loop did.
+                tasks_by_path = {}
+                for i, tup in enumerate(df.itertuples(index=False, name=None)):
+                    account = accounts[i]
                     if not account or account.lower() == "nan":
                         continue
 
-                    county = str(row.get("Property County", "Unknown")).strip().upper()
-                    occurrence = int(row["Occurrence_Number"])
-                    frequency = int(row["Account_Frequency"])
-
-                    if frequency > 1 and occurrence > 1:
-                        base_name = f"{account}_{county}_Mailout"
-                    else:
-                        base_name = f"{account}_Mailout"
-
-                    base_name = sanitize_filename(base_name)
-                    docx_abs = os.path.join(output_folder, f"{base_name}.docx")
-
-                    try:
-                        doc = MailMerge(template_path)
-                        merge_dict = row.to_dict()
-                        doc.merge(**merge_dict)
-                        doc.write(docx_abs)
-                        doc.close()
-
-                        if qr_mode == "With QR" and has_qr_col:
-                            url = row.get(QR_URL_COL, "").strip()
-                            if url:
-                                add_qr_xy_to_docx(
-                                    docx_abs, url, qr_temp_folder,
-                                    x_inches=x_pos, y_inches=y_pos,
-                                    qr_size_inches=qr_size
-                                )
-
-                        generated_docx_list.append(docx_abs)
-                    except Exception as e:
-                        error_count += 1
-                        st.warning(f"⚠️ Error for {account}: {str(e)[:120]}")
-
-                    progress = (idx + 1) / len(df) * 0.8
-                    progress_bar.progress(progress)
-                    status_text.text(f"Processing {idx + 1}/{len(df)}...")
-
-                # Combine DOCX
-                status_text.text("📦 Creating combined DOCX...")
+                    docx_abs = os.path.join(output_folder, f"{base_names[i]}.docx")
+                    url = urls[i] if want_url else ""
+                    # Only ship the fields the template can substitute;
+                    # anything else would just be iterated and ignored by
+                    # mailmerge (and pickled across to the worker).
+                    merge_dict = {k: v for k, v in zip(cols, tup) if k in merge_fields}
+                    tasks_by_path[docx_abs] = (merge_dict, docx_abs, account, url)
+                tasks = list(tasks_by_path.values())
+
+                # Prefer fork: spawn/forkserver workers would re-import
+                # this script as a module and replay its Streamlit calls.
+                if "fork" in multiprocessing.get_all_start_methods():
+                    mp_context = multiprocessing.get_context("fork")
+                else:
+                    mp_context = multiprocessing.get_context()
+
+                succeeded = set()
+                with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                         mp_context=mp_context,
+                                         initializer=_init_worker,
+                                         initargs=(template_bytes,)) as executor:
+                    futures = [
+                        executor.submit(
+                            _render_row, merge_dict, docx_abs, account, url,
+                            x_pos, y_pos, qr_size,
+                        )
+                        for merge_dict, docx_abs, account, url in tasks
+                    ]
+                    # Each progress update is a websocket frame to the
+                    # browser, so cap them at ~1% granularity.
+                    step = max(1, len(tasks) // 100)
+                    for done, fut in enumerate(as_completed(futures), start=1):
+                        docx_abs, warning = fut.result()
+                        if docx_abs is None:
+                            error_count += 1
+                        else:
+                            succeeded.add(docx_abs)
+                        if warning:
+                            st.warning(warning)
+                        if done % step == 0 or done == len(tasks):
+                            progress_bar.progress(done / len(tasks) * 0.8)
+                            status_text.text(f"Processing {done}/{len(tasks)}...")
+
+                # Preserve spreadsheet order for the combined document.
+                generated_docx_list = [t[1] for t in tasks if t[1] in succeeded]
+
+                # Combine DOCX (opt-in — skipped entirely by default)
                 master_docx_path = None
-                if generated_docx_list:
-                    master_doc = Document(generated_docx_list[0])
-                    composer = Composer(master_doc)
-                    for pth in generated_docx_list[1:]:
-                        if os.path.exists(pth):
+                if build_combined and generated_docx_list:
+                    status_text.text("📦 Creating combined DOCX...")
+                    master_docx_path = os.path.join(output_folder, "All_Mailouts_Combined.docx")
+                    try:
+                        _fast_combine(generated_docx_list, master_docx_path)
+                    except Exception:
+                        # Fall back to docxcompose if the fast path trips
+                        # on anything unexpected in a generated file.
+                        # Every path here was written by a worker in this
+                        # run, so no need to stat each file again.
+                        master_doc = Document(generated_docx_list[0])
+                        composer = Composer(master_doc)
+                        for pth in generated_docx_list[1:]:
                             try:
                                 d = Document(pth)
                                 composer.append(d)
                             except Exception:
                                 pass
-                    master_docx_path = os.path.join(output_folder, "All_Mailouts_Combined.docx")
-                    composer.save(master_docx_path)
+                        composer.save(master_docx_path)
 
                 progress_bar.progress(1.0)
                 status_text.empty()
                 progress_bar.empty()
 
-                # ZIP
-                zip_buffer = io.BytesIO()
-                with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+                # ZIP — written to the temp dir rather than a BytesIO so
+                # peak memory stays bounded no matter how many rows ran.
+                # DOCX files are already deflate-compressed zips, so
+                # re-deflating them buys ~0% size for a lot of CPU.
+                zip_path = os.path.join(tmpdir, "Mailouts_DOCX.zip")
+                with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf:
                     for pth in generated_docx_list:
                         zf.write(pth, arcname=os.path.basename(pth))
                     if master_docx_path:
                         zf.write(master_docx_path, arcname=os.path.basename(master_docx_path))
-                zip_buffer.seek(0)
 
                 st.markdown("---")
                 st.subheader("📥 Download Results")
 
                 col_a, col_b = st.columns(2)
                 with col_a:
-                    st.download_button(
-                        "📦 Download ZIP (All DOCX)",
-                        data=zip_buffer,
-                        file_name="Mailouts_DOCX.zip",
-                        mime="application/zip",
-                        use_container_width=True,
-                    )
+                    with open(zip_path, "rb") as fh:
+                        st.download_button(
+                            "📦 Download ZIP (All DOCX)",
+                            data=fh,
+                            file_name="Mailouts_DOCX.zip",
+                            mime="application/zip",
+                            use_container_width=True,
+                        )
                 with col_b:
-                    if master_docx_path and os.path.exists(master_docx_path):
+                    if master_docx_path:
                         with open(master_docx_path, "rb") as f:
                             st.download_button(
                                 "📄 Download Combined DOCX",